@@ -8,9 +8,9 @@ that have been updated since the last fetch. If the same URL appears with a newe
 lastmod than any previously fetched record, a new record (with a new id) is created.
 The output consists of:
 
-1. HTML files – each downloaded page is saved locally as {id}.html (an id is used
-   because the original URL is too long for a file name). Each HTML file is immediately
-   uploaded to GCS.
+1. HTML files – each downloaded page is gzip-compressed and immediately uploaded from
+   memory to GCS as {id}.html (an id is used because the original URL is too long for a
+   file name) with Content-Encoding: gzip, so readers receive the decompressed HTML.
 2. Meta information in JSON Lines format – each record contains:
       id, filename, fetched_at.
    These records (which also include the original URL internally for update comparisons)
@@ -48,25 +48,75 @@ If no sitemap URL is provided, the default is used.
 import os
 import requests
 import argparse
-import time
-import json
+import asyncio
+import gzip
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import Dict, Iterator, List, Optional, Tuple
 import xml.etree.ElementTree as ET
 from urllib.parse import urlparse
 import re
 
+import aiohttp
+import orjson
+from aiolimiter import AsyncLimiter
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from arknights_crawler.gcs import GCS_RETRY
 
 # Configuration for local temporary storage
-LOCAL_HTML_DIR: Path = Path("/tmp/html")
+LOCAL_META_DIR: Path = Path("/tmp/meta")
 LOCAL_META_FILE: Path = Path("/tmp/latest_meta.jsonl")
 
 # GCS configurations from environment variables
 GCS_BUCKET_NAME: str = os.environ.get("GCS_BUCKET_NAME", "")
 GCS_HTML_PREFIX: str = os.environ.get("GCS_HTML_PREFIX", "html/")
 GCS_META_PREFIX: str = os.environ.get("GCS_META_PREFIX", "meta/")
+# The prefixes normalized to end with exactly one "/" (or empty), so that blob names are built by
+# plain concatenation. GCS names always use "/", whatever os.path.join would use on the host.
+HTML_BLOB_PREFIX: str = GCS_HTML_PREFIX.rstrip("/") + "/" if GCS_HTML_PREFIX else ""
+META_BLOB_PREFIX: str = GCS_META_PREFIX.rstrip("/") + "/" if GCS_META_PREFIX else ""
+
+# Matches the YYYYMMDDhhmmss timestamp and the chunk number in meta file names (meta/index_{timestamp}_{chunkNum}.jsonl)
+_META_INDEX_RE: re.Pattern = re.compile(r'index_(\d{14})_(\d+)')
+
+# Concurrency and rate limits for page downloads (at most FETCH_RATE_LIMIT requests per FETCH_RATE_PERIOD_SECONDS)
+MAX_CONCURRENT_FETCHES: int = 20
+MAX_CONNECTIONS_PER_HOST: int = 8
+FETCH_RATE_LIMIT: float = 5
+FETCH_RATE_PERIOD_SECONDS: float = 3.0
+
+# Number of threads used to upload HTML files to GCS in the background. They share one storage.Client,
+# whose requests session keeps at most 10 pooled connections, so more threads would not reuse connections.
+MAX_UPLOAD_WORKERS: int = 10
+UPLOAD_TIMEOUT_SECONDS: float = 30.0
+
+# HTML is stored gzip-compressed (Content-Encoding: gzip); GCS decompresses it transparently on download
+HTML_GZIP_LEVEL: int = 5
+
+# HTTP client settings shared by the sitemap and page downloads
+USER_AGENT: str = "arknights-crawler/0.1"
+
+# XML namespace of <url>, <loc> and <lastmod> elements in the sitemap
+SITEMAP_NS: str = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+
+def create_http_session() -> requests.Session:
+    """
+    Creates a requests session that keeps connections alive and retries transient errors.
+    """
+    session = requests.Session()
+    session.headers.update({"User-Agent": USER_AGENT})
+    retry = Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=32, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+_session: requests.Session = create_http_session()
 
 def get_storage_client(project: Optional[str] = None) -> storage.Client:
     """Creates and returns a GCS storage client, using the specified project if provided."""
@@ -74,12 +124,18 @@ def get_storage_client(project: Optional[str] = None) -> storage.Client:
         return storage.Client(project=project)
     return storage.Client()
 
+@lru_cache(maxsize=None)
+def _get_bucket(bucket_name: str, project: Optional[str] = None) -> storage.Bucket:
+    """
+    Returns a bucket handle that is created once and shared by all GCS operations.
+    Client.bucket() builds the handle locally, whereas Client.get_bucket() sends a metadata request.
+    """
+    return get_storage_client(project).bucket(bucket_name)
+
 def download_from_gcs(bucket_name: str, source_blob_name: str, destination_file_name: str, project: Optional[str] = None) -> bool:
     """Downloads a blob from GCS to a local file."""
     try:
-        client = get_storage_client(project)
-        bucket = client.get_bucket(bucket_name)
-        blob = bucket.blob(source_blob_name)
+        blob = _get_bucket(bucket_name, project).blob(source_blob_name)
         if blob.exists():
             blob.download_to_filename(destination_file_name)
             print(f"Downloaded {source_blob_name} from GCS to {destination_file_name}")
@@ -94,16 +150,45 @@ def download_from_gcs(bucket_name: str, source_blob_name: str, destination_file_
 def upload_to_gcs(bucket_name: str, source_file_name: str, destination_blob_name: str, project: Optional[str] = None) -> bool:
     """Uploads a file to GCS."""
     try:
-        client = get_storage_client(project)
-        bucket = client.get_bucket(bucket_name)
-        blob = bucket.blob(destination_blob_name)
-        blob.upload_from_filename(source_file_name)
+        blob = _get_bucket(bucket_name, project).blob(destination_blob_name)
+        # Files here are far below the 8 MiB multipart limit, so this is a single request.
+        blob.upload_from_filename(
+            source_file_name,
+            timeout=UPLOAD_TIMEOUT_SECONDS,
+            checksum="crc32c",
+            retry=GCS_RETRY,
+        )
         print(f"Uploaded {source_file_name} to GCS as {destination_blob_name}")
         return True
     except Exception as ex:
         print(f"Error uploading {source_file_name} to GCS: {ex}")
         return False
 
+def upload_bytes_to_gcs(
+    bucket_name: str,
+    data: bytes,
+    destination_blob_name: str,
+    project: Optional[str] = None,
+    content_type: Optional[str] = None,
+    content_encoding: Optional[str] = None,
+) -> bool:
+    """Uploads in-memory bytes to GCS, optionally setting the Content-Type and Content-Encoding of the blob."""
+    try:
+        blob = _get_bucket(bucket_name, project).blob(destination_blob_name)
+        blob.content_encoding = content_encoding
+        blob.upload_from_string(
+            data,
+            content_type=content_type,
+            timeout=UPLOAD_TIMEOUT_SECONDS,
+            checksum="crc32c",
+            retry=GCS_RETRY,
+        )
+        print(f"Uploaded {destination_blob_name} to GCS")
+        return True
+    except Exception as ex:
+        print(f"Error uploading {destination_blob_name} to GCS: {ex}")
+        return False
+
 def extract_file_name(url: str) -> str:
     """
     Extracts the file part (path and query) from a URL, excluding the scheme and domain.
@@ -117,54 +202,54 @@ def extract_file_name(url: str) -> str:
 def parse_sitemap(sitemap_url: str) -> List[Tuple[str, Optional[str]]]:
     """
     Fetches and parses the sitemap XML, returning a list of tuples: (url, lastmod).
+    The response is parsed while it is streamed, and each <url> element is cleared once
+    its loc/lastmod have been read, so the full XML is never held in memory.
     """
     try:
-        response = requests.get(sitemap_url, timeout=10)
+        response = _session.get(sitemap_url, stream=True, timeout=10)
         response.raise_for_status()
-        xml_content = response.text
+        # Let urllib3 undo any Content-Encoding so that the parser receives plain XML.
+        response.raw.decode_content = True
     except Exception as ex:
         print(f"Failed to download sitemap from {sitemap_url}: {ex}")
         return []
     try:
-        root = ET.fromstring(xml_content)
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
         urls = []
-        for url_element in root.findall("ns:url", namespace):
-            loc_element = url_element.find("ns:loc", namespace)
-            lastmod_element = url_element.find("ns:lastmod", namespace)
+        for _, element in ET.iterparse(response.raw, events=("end",)):
+            if element.tag != SITEMAP_NS + "url":
+                continue
+            loc_element = element.find(SITEMAP_NS + "loc")
+            lastmod_element = element.find(SITEMAP_NS + "lastmod")
             if loc_element is not None and loc_element.text:
                 loc = loc_element.text.strip()
                 lastmod = (lastmod_element.text.strip() if lastmod_element is not None and lastmod_element.text else None)
                 urls.append((loc, lastmod))
+            element.clear()
         return urls
     except Exception as ex:
         print(f"Failed to parse sitemap XML: {ex}")
         return []
+    finally:
+        response.close()
 
-def load_previous_meta(project: Optional[str] = None) -> List[Dict]:
+def load_previous_meta(project: Optional[str] = None) -> None:
     """
-    Loads previous meta records from the latest meta file in GCS under the prefix GCS_META_PREFIX.
+    Loads the latest meta file from GCS under the prefix GCS_META_PREFIX into LOCAL_META_FILE.
     It lists blobs in the bucket with that prefix, selects the one with the latest timestamp
-    (extracted from its filename), downloads it, and loads its JSONL records.
-    Each record contains: id, filename, fetched_at, url.
+    (extracted from its filename) and downloads it. The records are read afterwards with
+    iter_local_meta, so they never have to be held in memory all at once.
     """
-    records = []
     LOCAL_META_FILE.parent.mkdir(parents=True, exist_ok=True)
     try:
-        client = get_storage_client(project)
-        bucket = client.get_bucket(GCS_BUCKET_NAME)
-        blobs = list(bucket.list_blobs(prefix=GCS_META_PREFIX))
-        latest_blob = None
-        latest_ts = None
-        pattern = re.compile(r'index_(\d{14})')
-        for blob in blobs:
-            m = pattern.search(blob.name)
-            if m:
-                ts_str = m.group(1)
-                ts = datetime.strptime(ts_str, "%Y%m%d%H%M%S")
-                if (latest_ts is None) or (ts > latest_ts):
-                    latest_ts = ts
-                    latest_blob = blob
+        bucket = _get_bucket(GCS_BUCKET_NAME, project)
+        # Only the names are needed to pick the latest file, so request no other object metadata.
+        blobs = bucket.list_blobs(prefix=META_BLOB_PREFIX, fields="items(name),nextPageToken")
+        candidates = [
+            ((m.group(1), int(m.group(2))), blob) for blob in blobs if (m := _META_INDEX_RE.search(blob.name))
+        ]
+        # YYYYMMDDhhmmss is zero-padded, so comparing the strings compares the timestamps. All chunks of
+        # a run share the run's timestamp, so the chunk number decides between them.
+        latest_blob = max(candidates, key=lambda c: c[0])[1] if candidates else None
         if latest_blob:
             print(f"Latest meta file in GCS: {latest_blob.name}")
             latest_blob.download_to_filename(str(LOCAL_META_FILE))
@@ -173,186 +258,260 @@ def load_previous_meta(project: Optional[str] = None) -> List[Dict]:
             print("No meta file found in GCS under the specified prefix.")
     except Exception as e:
         print(f"Error loading meta files from GCS: {e}")
-        return records
-    if LOCAL_META_FILE.exists():
-        with open(LOCAL_META_FILE, "r", encoding="utf-8") as f:
-            for line in f:
-                try:
-                    record = json.loads(line)
-                    records.append(record)
-                except Exception as ex:
-                    print(f"Error parsing meta record: {ex}")
-    return records
-
-def save_meta_chunk(meta_records: List[Dict], chunk_num: int) -> Path:
+        # New records are appended to LOCAL_META_FILE, so do not leave a stale or partial file behind.
+        LOCAL_META_FILE.unlink(missing_ok=True)
+
+def iter_local_meta() -> Iterator[Dict]:
     """
-    Writes the provided meta_records as a single JSONL file.
-    The file is named as: meta/index_{timestamp}_{chunkNum}.jsonl, where timestamp is in YYYYMMDDhhmmss format.
-    Returns the path to the generated file.
-    Each record output includes: id, filename, fetched_at.
+    Yields the meta records stored in LOCAL_META_FILE one at a time, reading the file line by line.
+    Each record contains: id, filename, fetched_at, url.
     """
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-    output_path = Path(f"/tmp/meta/index_{timestamp}_{chunk_num}.jsonl")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        for record in meta_records:
-            out_record = {
-                "id": record["id"],
-                "filename": record["filename"],
-                "fetched_at": record["fetched_at"]
-            }
-            f.write(json.dumps(out_record) + "\n")
-    return output_path
+    if not LOCAL_META_FILE.exists():
+        return
+    with LOCAL_META_FILE.open("rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                yield orjson.loads(line)
+            except orjson.JSONDecodeError as ex:
+                print(f"Error parsing meta record: {ex}")
+
+def normalize_lastmod(lastmod: str) -> str:
+    """
+    Converts a sitemap lastmod into the UTC isoformat() form used for fetched_at, so that the two
+    can be compared as strings. Values that are already in UTC are returned without being parsed.
+    A lastmod without an offset is treated as UTC.
+    """
+    if lastmod.endswith("Z"):
+        return lastmod[:-1] + "+00:00"
+    if lastmod.endswith("+00:00"):
+        return lastmod
+    parsed = datetime.fromisoformat(lastmod)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat()
+
+def needs_fetch(url: str, lastmod: Optional[str], url_latest: Dict[str, str]) -> bool:
+    """
+    Decides whether a sitemap entry has to be (re)fetched. This is the case when the URL has never
+    been fetched, when the sitemap gives no usable lastmod for it, or when its lastmod is newer than
+    the latest fetched_at recorded for it in url_latest.
+    """
+    latest = url_latest.get(url)
+    if latest is None or not lastmod:
+        return True
+    try:
+        return normalize_lastmod(lastmod) > latest
+    except ValueError:
+        return True
 
-def download_page(url: str) -> Optional[str]:
+async def download_page(session: aiohttp.ClientSession, url: str) -> Optional[str]:
     """
-    Downloads the content of the specified URL.
+    Downloads the content of the specified URL using the shared aiohttp session.
     """
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        return response.text
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            response.raise_for_status()
+            return await response.text()
     except Exception as ex:
         print(f"Failed to download {url}: {ex}")
         return None
 
+async def bounded_fetch(semaphore: asyncio.Semaphore, limiter: AsyncLimiter, session: aiohttp.ClientSession, url: str) -> Optional[str]:
+    """
+    Downloads a page while holding a slot of the semaphore, once the rate limiter allows another request.
+    """
+    async with semaphore:
+        async with limiter:
+            return await download_page(session, url)
+
+async def fetch_page(
+    semaphore: asyncio.Semaphore,
+    limiter: AsyncLimiter,
+    session: aiohttp.ClientSession,
+    url: str,
+) -> Optional[bytes]:
+    """
+    Downloads a page and returns it gzip-compressed, or None if the download failed.
+    """
+    content = await bounded_fetch(semaphore, limiter, session, url)
+    if content is None:
+        return None
+    # mtime=0 keeps the output identical for identical pages.
+    return gzip.compress(content.encode("utf-8"), compresslevel=HTML_GZIP_LEVEL, mtime=0)
+
 def process_updates(sitemap_url: str, meta_chunk_size: int, project: Optional[str] = None) -> None:
+    """
+    Synchronous entry point that runs process_updates_async on a new event loop.
+    """
+    asyncio.run(process_updates_async(sitemap_url, meta_chunk_size, project))
+
+async def process_updates_async(sitemap_url: str, meta_chunk_size: int, project: Optional[str] = None) -> None:
     """
     Processes the sitemap, fetches pages that are updated relative to previous meta data,
     outputs each HTML file with a new id, and creates meta records.
     HTML files and new meta records are immediately uploaded to GCS.
     
+    Pages are downloaded concurrently: at most MAX_CONCURRENT_FETCHES downloads are in flight
+    at once (and at most MAX_CONNECTIONS_PER_HOST connections to the same host), and requests are
+    started at no more than FETCH_RATE_LIMIT per FETCH_RATE_PERIOD_SECONDS. Results are
+    consumed in sitemap order, so ids are assigned in the same order as before.
+    GCS uploads run on a thread pool; the event loop awaits them (HTML uploads before each
+    meta chunk is flushed) instead of blocking on them, so downloads keep progressing.
+    A record whose HTML upload failed is left out of its meta chunk, so its URL is fetched again next time.
+    Every fetched page gets a new id, and its HTML is stored as {id}.html.
+
     This function accumulates new meta records. Once the number of new records reaches the chunk size,
     it flushes them: saving them as a meta JSONL file (named meta/index_{timestamp}_{chunkNum}.jsonl) and uploading it to GCS.
     After processing all URLs, if any new records remain (less than the chunk size), they are also flushed.
     
-    For each URL in the sitemap:
+    Before anything is downloaded, the sitemap is deduplicated and filtered with needs_fetch:
       - If a previous record exists with fetched_at >= sitemap.lastmod, skip.
       - Otherwise, download the page and create a new record.
     """
-    LOCAL_HTML_DIR.mkdir(parents=True, exist_ok=True)
+    LOCAL_META_DIR.mkdir(parents=True, exist_ok=True)
+    # Every meta chunk of this run is named after the run's start time plus its chunk number.
+    meta_timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
     
-    sitemap_entries = parse_sitemap(sitemap_url)
+    # The sitemap download and the previous meta download from GCS are independent, so run them together.
+    sitemap_entries, _ = await asyncio.gather(
+        asyncio.to_thread(parse_sitemap, sitemap_url),
+        asyncio.to_thread(load_previous_meta, project),
+    )
     print(f"Found {len(sitemap_entries)} URLs in sitemap.")
     
-    previous_meta = load_previous_meta(project)
-    # Build lookup: url -> latest fetched_at from previous meta.
-    url_latest: Dict[str, datetime] = {}
-    for record in previous_meta:
+    # Build lookup: url -> latest fetched_at from previous meta, and find the max id and the record
+    # count in the same pass. The records are streamed from the local file and never kept.
+    # fetched_at is always written as a UTC isoformat() string, so it is kept as a string and
+    # compared against the normalized sitemap lastmod without parsing either side.
+    url_latest: Dict[str, str] = {}
+    max_id = 0
+    cumulative_count = 0
+    for record in iter_local_meta():
+        cumulative_count += 1
         try:
+            record_id = record["id"]
+            if record_id > max_id:
+                max_id = record_id
             rec_url = record["url"]
-            fetched_at = datetime.fromisoformat(record["fetched_at"])
-            if rec_url in url_latest:
-                if fetched_at > url_latest[rec_url]:
-                    url_latest[rec_url] = fetched_at
-            else:
+            fetched_at = record["fetched_at"]
+            latest = url_latest.get(rec_url)
+            if latest is None or fetched_at > latest:
                 url_latest[rec_url] = fetched_at
         except Exception as ex:
             print(f"Error processing previous meta record: {ex}")
     
     new_meta_records: List[Dict] = []
-    cumulative_meta = previous_meta.copy()
-    next_id = 1
-    if previous_meta:
-        try:
-            max_id = max(record["id"] for record in previous_meta)
-            next_id = max_id + 1
-        except Exception:
-            pass
+    next_id = max_id + 1
+
+    # A URL listed more than once in the sitemap is fetched once, using its last lastmod.
+    unique_entries = dict(sitemap_entries)
+    urls_to_fetch = [url for url, lastmod in unique_entries.items() if needs_fetch(url, lastmod, url_latest)]
+    print(f"{len(urls_to_fetch)}/{len(unique_entries)} URLs need refetch.")
 
     chunk_counter = 0
-    for url, lastmod in sitemap_entries:
-        fetch_required = False
-        try:
-            if lastmod:
-                sitemap_lastmod = datetime.fromisoformat(lastmod.replace("Z", "+00:00"))
-            else:
-                sitemap_lastmod = None
-        except Exception as ex:
-            print(f"Error parsing lastmod for {url}: {ex}")
-            sitemap_lastmod = None
-
-        if url in url_latest and sitemap_lastmod is not None:
-            if sitemap_lastmod > url_latest[url]:
-                print(f"Update detected for {url}.")
-                fetch_required = True
-            else:
-                print(f"No update for {url}. Skipping.")
-        else:
-            fetch_required = True
+    # HTML uploads run in the background; they are awaited before each meta chunk is written
+    # so that a meta record never references an HTML file that has not been uploaded yet.
+    uploader = ThreadPoolExecutor(max_workers=MAX_UPLOAD_WORKERS)
+    # record id -> its pending HTML upload
+    pending_uploads: Dict[int, Future] = {}
 
-        if fetch_required:
-            content = download_page(url)
-            if content is None:
-                print(f"Failed to download {url}.")
-                continue
-            html_filename = f"{next_id}.html"
-            local_html_path = LOCAL_HTML_DIR / html_filename
-            with open(local_html_path, "w", encoding="utf-8") as f:
-                f.write(content)
-            print(f"Saved HTML for {url} as {html_filename}.")
-            if GCS_BUCKET_NAME:
-                destination_blob = os.path.join(GCS_HTML_PREFIX, html_filename)
-                upload_to_gcs(GCS_BUCKET_NAME, str(local_html_path), destination_blob, project)
-            fetched_at = datetime.now(timezone.utc).isoformat()
-            new_record = {
-                "id": next_id,
-                "filename": html_filename,
-                "fetched_at": fetched_at,
-                "url": url
-            }
-            new_meta_records.append(new_record)
-            cumulative_meta.append(new_record)
-            next_id += 1
-            time.sleep(3)
-            # If new_meta_records reached the chunk size, flush them.
-            if len(new_meta_records) >= meta_chunk_size:
-                chunk_counter += 1
-                meta_chunk_path = save_meta_chunk(new_meta_records, chunk_counter)
-                if GCS_BUCKET_NAME:
-                    destination_blob = os.path.join(GCS_META_PREFIX, meta_chunk_path.name)
-                    upload_to_gcs(GCS_BUCKET_NAME, str(meta_chunk_path), destination_blob, project)
-                # Clear the new records for new chunk.
-                new_meta_records.clear()
-                # Update LOCAL_META_FILE with cumulative meta.
-                with open(LOCAL_META_FILE, "w", encoding="utf-8") as f:
-                    for record in cumulative_meta:
-                        f.write(json.dumps(record) + "\n")
-                print(f"Flushed meta chunk {chunk_counter}; cumulative meta records: {len(cumulative_meta)}.")
-
-    # Flush any remaining new meta records if they did not reach chunk_size.
-    if new_meta_records:
-        chunk_counter += 1
-        meta_chunk_path = save_meta_chunk(new_meta_records, chunk_counter)
-        if GCS_BUCKET_NAME:
-            destination_blob = os.path.join(GCS_META_PREFIX, meta_chunk_path.name)
-            upload_to_gcs(GCS_BUCKET_NAME, str(meta_chunk_path), destination_blob, project)
+    async def flush_new_meta_records() -> int:
+        """
+        Waits for the pending HTML uploads, then writes the new records as the next meta chunk.
+        Records whose HTML upload failed are dropped, so their URLs are fetched again next time.
+        Returns the number of records written.
+        """
+        nonlocal chunk_counter
+        upload_results = await asyncio.gather(*(asyncio.wrap_future(future) for future in pending_uploads.values()))
+        failed_ids = {record_id for record_id, uploaded in zip(pending_uploads, upload_results) if not uploaded}
+        pending_uploads.clear()
+        records = [record for record in new_meta_records if record["id"] not in failed_ids]
         new_meta_records.clear()
-        with open(LOCAL_META_FILE, "w", encoding="utf-8") as f:
-            for record in cumulative_meta:
-                f.write(json.dumps(record) + "\n")
-        print(f"Flushed final meta chunk {chunk_counter}; total meta records: {len(cumulative_meta)}.")
+        if failed_ids:
+            print(f"Dropped {len(failed_ids)} meta records whose HTML upload failed: {sorted(failed_ids)}")
+        if not records:
+            return 0
+        chunk_counter += 1
+        meta_chunk_path = save_meta_chunk(records, chunk_counter, meta_timestamp)
+        destination_blob = f"{META_BLOB_PREFIX}{meta_chunk_path.name}"
+        await asyncio.wrap_future(
+            uploader.submit(upload_to_gcs, GCS_BUCKET_NAME, str(meta_chunk_path), destination_blob, project)
+        )
+        append_local_meta(records)
+        return len(records)
+
+    try:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        limiter = AsyncLimiter(FETCH_RATE_LIMIT, FETCH_RATE_PERIOD_SECONDS)
+        connector = aiohttp.TCPConnector(limit=MAX_CONCURRENT_FETCHES, limit_per_host=MAX_CONNECTIONS_PER_HOST)
+        async with aiohttp.ClientSession(connector=connector, headers={"User-Agent": USER_AGENT}) as session:
+            tasks = [
+                asyncio.create_task(fetch_page(semaphore, limiter, session, url))
+                for url in urls_to_fetch
+            ]
+            for url, task in zip(urls_to_fetch, tasks):
+                compressed = await task
+                if compressed is None:
+                    print(f"Failed to download {url}.")
+                    continue
+                record_id = next_id
+                next_id += 1
+                html_filename = f"{record_id}.html"
+                # Uploaded straight from memory; the page is not written to local disk.
+                destination_blob = f"{HTML_BLOB_PREFIX}{html_filename}"
+                pending_uploads[record_id] = uploader.submit(
+                    upload_bytes_to_gcs, GCS_BUCKET_NAME, compressed, destination_blob, project,
+                    content_type="text/html; charset=utf-8", content_encoding="gzip",
+                )
+                fetched_at = datetime.now(timezone.utc).isoformat()
+                new_record = {
+                    "id": record_id,
+                    "filename": html_filename,
+                    "fetched_at": fetched_at,
+                    "url": url
+                }
+                new_meta_records.append(new_record)
+                # If new_meta_records reached the chunk size, flush them.
+                if len(new_meta_records) >= meta_chunk_size:
+                    cumulative_count += await flush_new_meta_records()
+                    print(f"Flushed meta chunk {chunk_counter}; cumulative meta records: {cumulative_count}.")
+
+        # Flush any remaining new meta records if they did not reach chunk_size.
+        if new_meta_records:
+            cumulative_count += await flush_new_meta_records()
+            print(f"Flushed final meta chunk {chunk_counter}; total meta records: {cumulative_count}.")
+    finally:
+        uploader.shutdown(wait=True)
 
-def save_meta_chunk(meta_records: List[Dict], chunk_num: int) -> Path:
+def save_meta_chunk(meta_records: List[Dict], chunk_num: int, timestamp: str) -> Path:
     """
-    Writes the provided meta_records as a single JSONL file.
-    The file is named as: meta/index_{YYYYMMDDhhmmss}_{chunkNum}.jsonl.
+    Writes the provided meta_records as a single JSONL file in LOCAL_META_DIR, which must exist.
+    The file is named as: meta/index_{timestamp}_{chunkNum}.jsonl, timestamp being the run's
+    YYYYMMDDhhmmss start time.
     Returns the path to the generated file.
     Each record output includes: id, filename, fetched_at.
     """
-    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
-    output_path = Path(f"/tmp/meta/index_{timestamp}_{chunk_num}.jsonl")
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(output_path, "w", encoding="utf-8") as f:
-        for record in meta_records:
-            out_record = {
-                "id": record["id"],
-                "filename": record["filename"],
-                "fetched_at": record["fetched_at"]
-            }
-            f.write(json.dumps(out_record) + "\n")
+    output_path = LOCAL_META_DIR / f"index_{timestamp}_{chunk_num}.jsonl"
+    # Only three known fields are written, so format them directly instead of building a dict,
+    # and write the whole chunk with a single call.
+    output_path.write_bytes(b"".join(
+        b'{"id":%d,"filename":%b,"fetched_at":%b}\n' % (
+            record["id"], orjson.dumps(record["filename"]), orjson.dumps(record["fetched_at"])
+        )
+        for record in meta_records
+    ))
     return output_path
 
+def append_local_meta(meta_records: List[Dict]) -> None:
+    """
+    Appends the provided meta_records (including url) to LOCAL_META_FILE, which already holds
+    the previous meta, so that the file always contains the cumulative meta without rewriting it.
+    """
+    with open(LOCAL_META_FILE, "ab") as f:
+        f.write(b"".join(orjson.dumps(record) + b"\n" for record in meta_records))
+
 def parse_arguments() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Crawl sitemap and fetch updated pages, outputting HTML and meta JSONL files to GCS.")
     parser.add_argument("--sitemap-url", type=str, default="https://arknights.wikiru.jp/index.php?plugin=sitemap",
@@ -15,56 +15,88 @@ This module connects to Google Cloud Storage to:
 The design is implemented with pure functions for business logic and isolates I/O operations.
 """
 
-import json
-import os
-from datetime import datetime
-from typing import Any, Dict, List, Tuple
-
-from bs4 import BeautifulSoup
+import asyncio
+import gzip
+import io
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime, timezone
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import orjson
+from google.api_core.exceptions import NotFound
 from google.cloud import storage
+from selectolax.lexbor import LexborHTMLParser
+
+from arknights_crawler.gcs import GCS_RETRY
+
+# Listing projection and page size: listings only ever need the object names
+LIST_FIELDS: str = "items(name),nextPageToken"
+LIST_PAGE_SIZE: int = 1000
+
+# Extracted HTML above this size (in bytes) is uploaded gzip-compressed (Content-Encoding: gzip).
+# Metadata JSONL is left uncompressed so that its chunks can be composed.
+GZIP_MIN_SIZE: int = 4096
+GZIP_LEVEL: int = 5
+
+# Maximum number of source objects in a single GCS compose request
+MAX_COMPOSE_SOURCES: int = 32
+
+# Number of worker threads (each with its own storage.Client) downloading, extracting and uploading HTML blobs
+MAX_EXTRACT_WORKERS: int = 16
+
+# Number of processes extracting the div#body content (None: one per CPU)
+MAX_PARSE_PROCESSES: Optional[int] = None
+
+# Number of threads uploading metadata chunks in the background
+MAX_META_FLUSH_WORKERS: int = 2
+
+# Per-thread state of the extraction workers
+_worker_local = threading.local()
 
 
 # ---------------------------
 # Pure functions for HTML extraction
 # ---------------------------
-def extract_body(html: str) -> str:
+def extract_body(html: bytes) -> str:
     """Extract HTML content within the div having id 'body'.
 
-    This function uses BeautifulSoup to parse the given HTML text and extract the
-    inner HTML of the <div id="body"> element. The outer div tag is excluded, only
-    its children are returned.
+    This function parses the given HTML with selectolax's Lexbor parser (a C HTML5
+    parser) and extracts the inner HTML of the <div id="body"> element. The outer div tag
+    is excluded, only its children are returned.
 
     Args:
-        html (str): The input HTML content as a string.
+        html (bytes): The input HTML content as UTF-8 encoded bytes.
 
     Returns:
         str: The inner HTML of the div with id 'body'. Returns an empty string if not found.
     """
-    soup = BeautifulSoup(html, "html.parser")
-    body_div = soup.find("div", id="body")
-    if body_div:
-        return "".join(str(child) for child in body_div.children)
+    body_div = LexborHTMLParser(html).css_first("div#body")
+    if body_div is not None:
+        return body_div.inner_html or ""
     return ""
 
 
 def process_html_content(
-    original_html_id: str, html_content: str, new_id: int
+    original_html_id: str, html_content: bytes, new_id: int, processed_at: str
 ) -> Tuple[str, Dict[str, Any]]:
     """Process HTML content to extract target segment and create metadata.
 
     Extracts content using extract_body and compiles metadata including a new auto-assigned
-    ID, the original HTML ID derived from GCS blob name, and the current processing timestamp.
+    ID, the original HTML ID derived from GCS blob name, and the given processing timestamp.
 
     Args:
         original_html_id (str): The original identifier derived from the HTML file name.
-        html_content (str): The HTML content as a string.
+        html_content (bytes): The HTML content as UTF-8 encoded bytes.
         new_id (int): The new auto-assigned ID for the extraction.
+        processed_at (str): The processing timestamp (ISO 8601, UTC) shared by the whole run.
 
     Returns:
         Tuple[str, Dict[str, Any]]: A tuple with the extracted HTML content and its metadata.
     """
     extracted_html = extract_body(html_content)
-    processed_at = datetime.now(datetime.timezone.utc).isoformat() + "Z"
     meta = {
         "id": new_id,
         "original_html_id": original_html_id,
@@ -77,12 +109,13 @@ def process_html_content(
 # GCS Helper Functions
 # ---------------------------
 def get_latest_max_ids(
-    bucket: storage.bucket.Bucket, meta_prefix: str = "meta/index_"
+    bucket: storage.bucket.Bucket, meta_prefix: str = "meta/extracted_"
 ) -> Tuple[int, int]:
     """Retrieve the maximum processed id and maximum original_html_id from the latest metadata file in GCS.
 
-    It lists all blobs under the given meta_prefix, selects the one with the highest timestamp based
-    on its filename, reads its JSONL content, and finds the maximum values.
+    It lists all blobs under the given meta_prefix and selects the one with the highest timestamp based
+    on its filename. The maximum values are taken from its custom metadata (max_id and
+    max_original_html_id) when present; otherwise its JSONL content is read and scanned.
     Assumes that both 'id' and 'original_html_id' can be interpreted as integers.
 
     Args:
@@ -92,7 +125,14 @@ def get_latest_max_ids(
     Returns:
         Tuple[int, int]: A tuple (max_meta_id, max_original_html_id). Returns (0, 0) if no metadata file exists.
     """
-    blobs = list(bucket.list_blobs(prefix=meta_prefix))
+    # The custom metadata comes with the listing, so the summary needs no extra request.
+    blobs = list(
+        bucket.list_blobs(
+            prefix=meta_prefix,
+            fields="items(name,metadata),nextPageToken",
+            page_size=LIST_PAGE_SIZE,
+        )
+    )
     if not blobs:
         return 0, 0
 
@@ -102,25 +142,48 @@ def get_latest_max_ids(
         key=lambda b: b.name.split("_")[-1].split(".")[0] if "_" in b.name else "",
     )
 
+    summary = latest_blob.metadata or {}
+    try:
+        return int(summary["max_id"]), int(summary["max_original_html_id"])
+    except (KeyError, ValueError):
+        pass
+
     try:
-        content = latest_blob.download_as_text(encoding="utf-8")
+        content = latest_blob.download_as_bytes()
     except Exception:
         return 0, 0
 
-    max_meta_id = 0
-    max_original_id = 0
-    for line in content.splitlines():
+    # orjson parses the UTF-8 bytes directly, so the content is never decoded as a whole.
+    lines = [line for line in content.splitlines() if line]
+    try:
+        # Fast path: every line is a well-formed record.
+        ids = [
+            (int(record.get("id", 0)), int(record.get("original_html_id", 0)))
+            for record in map(orjson.loads, lines)
+        ]
+    except ValueError:
+        ids = list(parse_meta_ids(lines))
+
+    max_meta_id = max((record_id for record_id, _ in ids), default=0)
+    max_original_id = max((original_id for _, original_id in ids), default=0)
+    return max_meta_id, max_original_id
+
+
+def parse_meta_ids(lines: List[bytes]) -> Iterator[Tuple[int, int]]:
+    """Yield (id, original_html_id) for each valid metadata JSONL line, skipping invalid ones.
+
+    Args:
+        lines (List[bytes]): The JSONL lines.
+
+    Yields:
+        Tuple[int, int]: The id and original_html_id of a record.
+    """
+    for line in lines:
         try:
-            record = json.loads(line)
-            record_id = int(record.get("id", 0))
-            original_id = int(record.get("original_html_id", 0))
-            if record_id > max_meta_id:
-                max_meta_id = record_id
-            if original_id > max_original_id:
-                max_original_id = original_id
-        except (ValueError, json.JSONDecodeError):
+            record = orjson.loads(line)
+            yield int(record.get("id", 0)), int(record.get("original_html_id", 0))
+        except (ValueError, orjson.JSONDecodeError):
             continue
-    return max_meta_id, max_original_id
 
 
 def list_new_html_blobs(
@@ -139,19 +202,23 @@ def list_new_html_blobs(
     Returns:
         List[storage.Blob]: A list of GCS Blob objects for new HTML files to process.
     """
-    new_blobs = []
-    blobs = bucket.list_blobs(prefix=html_prefix)
+    # (original_id, blob) pairs, so that each name is parsed only once.
+    candidates: List[Tuple[int, storage.Blob]] = []
+    # Only the names are needed, so request no other object metadata.
+    blobs = bucket.list_blobs(
+        prefix=html_prefix, fields=LIST_FIELDS, page_size=LIST_PAGE_SIZE
+    )
     for blob in blobs:
-        base_name = os.path.basename(blob.name)
-        original_id_str, ext = os.path.splitext(base_name)
+        # "html/123.html" -> "123"
+        original_id_str = blob.name.rpartition("/")[2].rpartition(".")[0]
         try:
             original_id = int(original_id_str)
             if original_id > min_original_id:
-                new_blobs.append(blob)
+                candidates.append((original_id, blob))
         except ValueError:
             continue
-    new_blobs.sort(key=lambda b: int(os.path.splitext(os.path.basename(b.name))[0]))
-    return new_blobs
+    candidates.sort(key=itemgetter(0))
+    return [blob for _, blob in candidates]
 
 
 def upload_string_to_gcs(
@@ -162,6 +229,9 @@ def upload_string_to_gcs(
 ) -> None:
     """Upload a string content to GCS at the specified blob destination.
 
+    HTML content larger than GZIP_MIN_SIZE bytes is gzip-compressed before the upload and
+    stored with Content-Encoding: gzip; GCS decompresses it transparently on download.
+
     Args:
         bucket (storage.bucket.Bucket): The GCS bucket object.
         destination_blob_name (str): The destination path in the bucket.
@@ -169,29 +239,148 @@ def upload_string_to_gcs(
         content_type (str): The MIME type of the content.
     """
     blob = bucket.blob(destination_blob_name)
-    blob.upload_from_string(content, content_type=content_type)
+    data = content.encode("utf-8")
+    if content_type == "text/html" and len(data) > GZIP_MIN_SIZE:
+        data = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        blob.content_encoding = "gzip"
+    blob.upload_from_string(data, content_type=content_type, retry=GCS_RETRY)
+
+
+def upload_meta_records(
+    bucket: storage.bucket.Bucket,
+    destination_blob_name: str,
+    meta_records: List[Dict[str, Any]],
+) -> None:
+    """Upload metadata records to GCS as a JSONL file.
+
+    Each record is encoded straight into an in-memory buffer, one line at a time,
+    instead of joining all records into one large string first.
+
+    Args:
+        bucket (storage.bucket.Bucket): The GCS bucket object.
+        destination_blob_name (str): The destination blob name in GCS.
+        meta_records (List[Dict[str, Any]]): The metadata records to upload.
+    """
+    buffer = io.BytesIO()
+    for record in meta_records:
+        buffer.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+    blob = bucket.blob(destination_blob_name)
+    blob.upload_from_file(
+        buffer, rewind=True, content_type="application/json", retry=GCS_RETRY
+    )
+
+
+def compose_blobs(
+    bucket: storage.bucket.Bucket,
+    source_blob_names: List[str],
+    destination_blob_name: str,
+    content_type: str,
+    metadata: Optional[Dict[str, str]] = None,
+) -> None:
+    """Concatenate blobs into one blob inside GCS and delete the sources.
+
+    GCS composes at most MAX_COMPOSE_SOURCES objects per request, so larger lists are folded
+    in batches, each batch being appended to the destination composed so far.
+
+    Args:
+        bucket (storage.bucket.Bucket): The GCS bucket object.
+        source_blob_names (List[str]): The blobs to concatenate, in order.
+        destination_blob_name (str): The destination blob name in GCS.
+        content_type (str): The MIME type of the destination blob.
+        metadata (Optional[Dict[str, str]]): Custom metadata to set on the destination blob.
+    """
+    sources = [bucket.blob(name) for name in source_blob_names]
+    destination = bucket.blob(destination_blob_name)
+    destination.content_type = content_type
+    destination.metadata = metadata
+    destination.compose(sources[:MAX_COMPOSE_SOURCES])
+    for start in range(MAX_COMPOSE_SOURCES, len(sources), MAX_COMPOSE_SOURCES - 1):
+        destination.compose(
+            [destination] + sources[start : start + MAX_COMPOSE_SOURCES - 1]
+        )
+    bucket.delete_blobs(sources)
 
 
 # ---------------------------
 # Main extraction process using GCS
 # ---------------------------
-def run_extraction(
-    input_dir: str, meta_chunk_size: int, gcs_project: str, gcs_bucket_name: str
+def init_extract_worker(gcs_project: str, gcs_bucket_name: str) -> None:
+    """Create a storage.Client owned by the current extraction worker thread.
+
+    A single client tops out well below what the bucket can serve no matter how many
+    requests are in flight, so every worker thread talks to GCS through its own client.
+
+    Args:
+        gcs_project (str): Google Cloud Storage project name.
+        gcs_bucket_name (str): Google Cloud Storage bucket name.
+    """
+    client = storage.Client(project=gcs_project)
+    _worker_local.bucket = client.bucket(gcs_bucket_name)
+
+
+def extract_blob(
+    blob_name: str, new_id: int, processed_at: str, parser: Executor
+) -> Optional[Dict[str, Any]]:
+    """Download one HTML blob, extract its body and upload the result to GCS.
+
+    Runs in an extraction worker thread set up by init_extract_worker and uses that
+    thread's own bucket. Transient GCS errors (429/5xx) are retried with exponential backoff.
+    A blob that no longer exists is skipped. Any other failure is raised, so that the run
+    stops before its metadata summary moves past a page that was not extracted.
+
+    Args:
+        blob_name (str): The name of the HTML blob to process.
+        new_id (int): The ID assigned to this extraction.
+        processed_at (str): The processing timestamp recorded in the metadata.
+        parser (Executor): Process pool that runs the CPU-bound extraction.
+
+    Returns:
+        Optional[Dict[str, Any]]: The metadata of the extraction, or None if the blob was
+        deleted after it was listed.
+    """
+    bucket = _worker_local.bucket
+    original_html_id = blob_name.rpartition("/")[2].rpartition(".")[0]
+    try:
+        html_content = bucket.blob(blob_name).download_as_bytes(retry=GCS_RETRY)
+    except NotFound:
+        print(f"Skipping {blob_name}: it no longer exists.")
+        return None
+    except Exception as ex:
+        print(f"Failed to download {blob_name}: {ex}")
+        raise
+
+    # Extraction is CPU-bound and holds the GIL, so it runs in a separate process.
+    extracted_html, meta = parser.submit(
+        process_html_content, original_html_id, html_content, new_id, processed_at
+    ).result()
+
+    # Upload extracted HTML to GCS: output/extracted/{new_id}.html
+    extracted_blob_name = f"extracted/{new_id}.html"
+    try:
+        upload_string_to_gcs(
+            bucket, extracted_blob_name, extracted_html, content_type="text/html"
+        )
+    except Exception as ex:
+        print(f"Failed to upload {extracted_blob_name} extracted from {blob_name}: {ex}")
+        raise
+    return meta
+
+
+async def run_extraction_async(
+    meta_chunk_size: int, gcs_project: str, gcs_bucket_name: str
 ) -> None:
-    """Run the extraction process by interfacing with Google Cloud Storage.
+    """Run the extraction process concurrently against Google Cloud Storage.
 
     1. Connects to GCS using provided project and bucket names.
     2. Retrieves the latest metadata file to determine the maximum processed IDs.
     3. Lists new HTML files in the 'html/' folder with original_html_id greater than the maximum processed.
-    4. For each new HTML file:
-         - Downloads the file content.
-         - Extracts the target HTML segment.
-         - Uploads the extracted HTML to 'output/extracted/{new_id}.html'.
-         - Accumulates metadata.
-    5. Uploads metadata in chunks to 'output/meta/' as JSONL files.
+    4. Assigns an ID to every new HTML file up front and processes them on MAX_EXTRACT_WORKERS
+       threads, each with its own storage.Client, using extract_blob (download, extract on a
+       pool of MAX_PARSE_PROCESSES processes, upload to 'output/extracted/{new_id}.html').
+    5. Collects the metadata in ID order and uploads it in chunks to 'output/meta/parts/' as JSONL
+       files, which are finally composed into a single 'output/meta/extracted_{timestamp}.jsonl'.
 
     Args:
-        input_dir (str): Not used; provided for compatibility with CLI wrapper.
         meta_chunk_size (int): Number of metadata records per output JSONL file.
         gcs_project (str): Google Cloud Storage project name.
         gcs_bucket_name (str): Google Cloud Storage bucket name.
@@ -202,58 +391,123 @@ def run_extraction(
     # Retrieve maximum IDs from the latest metadata file
     max_meta_id, max_original_id = get_latest_max_ids(
         bucket,
-        meta_prefix="meta/index_",
+        meta_prefix="meta/extracted_",
     )
-    new_id = max_meta_id + 1
 
     # List new HTML blobs from 'html/' folder
     new_html_blobs = list_new_html_blobs(
         bucket, html_prefix="html/", min_original_id=max_original_id
     )
 
+    # All records of a run share one processing timestamp, which also names its metadata file.
+    run_started_at = datetime.now(timezone.utc)
+    processed_at = run_started_at.isoformat().replace("+00:00", "Z")
+    run_timestamp = run_started_at.strftime("%Y%m%d%H%M%S")
+
+    # IDs are assigned before processing starts so that blobs can be processed in any order.
+    loop = asyncio.get_running_loop()
+    # forkserver: the pool's processes are started while other threads are already running.
+    parser = ProcessPoolExecutor(
+        max_workers=MAX_PARSE_PROCESSES,
+        mp_context=multiprocessing.get_context("forkserver"),
+    )
+    extractor = ThreadPoolExecutor(
+        max_workers=MAX_EXTRACT_WORKERS,
+        initializer=init_extract_worker,
+        initargs=(gcs_project, gcs_bucket_name),
+    )
+    tasks = [
+        loop.run_in_executor(
+            extractor, extract_blob, blob.name, new_id, processed_at, parser
+        )
+        for new_id, blob in enumerate(new_html_blobs, start=max_meta_id + 1)
+    ]
+
     meta_records: List[Dict[str, Any]] = []
+    # (name, max id, max original_html_id) of every metadata chunk flushed so far, in ID order.
+    # They are composed into one file at the end of the run, also when the run fails.
+    meta_parts: List[Tuple[str, int, int]] = []
+    meta_part_prefix = f"meta/parts/extracted_{run_timestamp}_"
+    # Chunks are uploaded in the background while the next results are consumed.
+    flusher = ThreadPoolExecutor(max_workers=MAX_META_FLUSH_WORKERS)
+    pending_flushes: List[asyncio.Future] = []
+
+    def flush_meta_records(records: List[Dict[str, Any]]) -> None:
+        meta_part_name = f"{meta_part_prefix}{len(meta_parts) + 1}.jsonl"
+        meta_parts.append((meta_part_name, max_meta_id, max_original_id))
+        pending_flushes.append(
+            loop.run_in_executor(
+                flusher, upload_meta_records, bucket, meta_part_name, records
+            )
+        )
 
-    for blob in new_html_blobs:
-        base_name = os.path.basename(blob.name)
-        original_html_id, _ = os.path.splitext(base_name)
-        try:
-            html_content = blob.download_as_text(encoding="utf-8")
-        except Exception:
-            continue
+    try:
+        # Results are consumed in ID order, so each metadata chunk holds consecutive IDs.
+        for task in tasks:
+            meta = await task
+            if meta is None:
+                continue
+            meta_records.append(meta)
+            # Results arrive in ID order, so the latest record holds the highest IDs so far.
+            max_meta_id = meta["id"]
+            max_original_id = max(max_original_id, int(meta["original_html_id"]))
+
+            if len(meta_records) >= meta_chunk_size:
+                flush_meta_records(meta_records)
+                meta_records = []
+
+        if meta_records:
+            flush_meta_records(meta_records)
+    finally:
+        # Blobs that have not been started yet are dropped if the run failed.
+        extractor.shutdown(wait=True, cancel_futures=True)
+        parser.shutdown(wait=True, cancel_futures=True)
+        flush_results = await asyncio.gather(*pending_flushes, return_exceptions=True)
+        flusher.shutdown(wait=True)
+
+        # Only the chunks up to the first failed upload are kept, so that the summary never
+        # skips over records that are missing from the composed file.
+        uploaded_count = 0
+        for result in flush_results:
+            if isinstance(result, BaseException):
+                break
+            uploaded_count += 1
+        if uploaded_count:
+            meta_part_names = [name for name, _, _ in meta_parts[:uploaded_count]]
+            _, parts_max_id, parts_max_original_id = meta_parts[uploaded_count - 1]
+            # Concatenate the chunks inside GCS into a single metadata file for the run.
+            await asyncio.to_thread(
+                compose_blobs,
+                bucket,
+                meta_part_names,
+                f"meta/extracted_{run_timestamp}.jsonl",
+                content_type="application/json",
+                # Lets get_latest_max_ids read the maxima without downloading the file.
+                metadata={
+                    "max_id": str(parts_max_id),
+                    "max_original_html_id": str(parts_max_original_id),
+                },
+            )
 
-        extracted_html, meta = process_html_content(
-            original_html_id, html_content, new_id
-        )
+    for result in flush_results:
+        if isinstance(result, BaseException):
+            raise result
 
-        # Upload extracted HTML to GCS: output/extracted/{new_id}.html
-        extracted_blob_name = f"extracted/{new_id}.html"
-        upload_string_to_gcs(
-            bucket, extracted_blob_name, extracted_html, content_type="text/html"
-        )
 
-        meta_records.append(meta)
-        new_id += 1
+def run_extraction(
+    input_dir: str, meta_chunk_size: int, gcs_project: str, gcs_bucket_name: str
+) -> None:
+    """Run the extraction process by interfacing with Google Cloud Storage.
 
-        if len(meta_records) >= meta_chunk_size:
-            timestamp = datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
-            meta_blob_name = f"meta/extracted_{timestamp}.jsonl"
-            meta_content = "\n".join(
-                json.dumps(record, ensure_ascii=False) for record in meta_records
-            )
-            upload_string_to_gcs(
-                bucket, meta_blob_name, meta_content, content_type="application/json"
-            )
-            meta_records = []
+    This is a synchronous wrapper that runs run_extraction_async on a new event loop.
 
-    if meta_records:
-        timestamp = datetime.now(datetime.timezone.utc).strftime("%Y%m%d%H%M%S")
-        meta_blob_name = f"meta/extracted_{timestamp}.jsonl"
-        meta_content = "\n".join(
-            json.dumps(record, ensure_ascii=False) for record in meta_records
-        )
-        upload_string_to_gcs(
-            bucket, meta_blob_name, meta_content, content_type="application/json"
-        )
+    Args:
+        input_dir (str): Not used; provided for compatibility with CLI wrapper.
+        meta_chunk_size (int): Number of metadata records per output JSONL file.
+        gcs_project (str): Google Cloud Storage project name.
+        gcs_bucket_name (str): Google Cloud Storage bucket name.
+    """
+    asyncio.run(run_extraction_async(meta_chunk_size, gcs_project, gcs_bucket_name))
 
 
 def main(
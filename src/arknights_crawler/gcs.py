@@ -0,0 +1,13 @@
+"""
+Google Cloud Storage settings shared by the crawler and the extract modules.
+"""
+
+from google.api_core.retry import Retry
+from google.cloud.storage.retry import DEFAULT_RETRY
+
+# Retry for GCS requests: backs off only on transient errors (429, 5xx, connection errors),
+# starting at 0.5s and doubling up to 10s, instead of DEFAULT_RETRY's 1s..60s.
+# It is also passed to uploads, which GCS does not retry by default because they are not
+# conditional. A retry re-sends the same payload to the same blob, and no other process
+# writes these blobs while a crawl or extraction runs, so it cannot overwrite newer data.
+GCS_RETRY: Retry = DEFAULT_RETRY.with_delay(initial=0.5, maximum=10.0, multiplier=2.0)
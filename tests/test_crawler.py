@@ -0,0 +1,50 @@
+"""Unit tests for the pure functions of arknights_crawler.crawler."""
+
+from typing import Dict, Optional
+
+import pytest
+
+from arknights_crawler.crawler import needs_fetch, normalize_lastmod
+
+
+@pytest.mark.parametrize(
+    ("lastmod", "expected"),
+    [
+        ("2025-03-01T12:34:56Z", "2025-03-01T12:34:56+00:00"),
+        ("2025-03-01T12:34:56+00:00", "2025-03-01T12:34:56+00:00"),
+        ("2025-03-01T21:34:56+09:00", "2025-03-01T12:34:56+00:00"),
+        ("2025-03-01T12:34:56", "2025-03-01T12:34:56+00:00"),
+        ("2025-03-01", "2025-03-01T00:00:00+00:00"),
+    ],
+)
+def test_normalize_lastmod(lastmod: str, expected: str) -> None:
+    """normalize_lastmod returns the UTC isoformat() form used for fetched_at."""
+    assert normalize_lastmod(lastmod) == expected
+
+
+def test_normalize_lastmod_rejects_invalid_value() -> None:
+    """An unparsable lastmod raises ValueError."""
+    with pytest.raises(ValueError):
+        normalize_lastmod("yesterday")
+
+
+URL = "https://example.com/page"
+URL_LATEST: Dict[str, str] = {URL: "2025-03-01T12:00:00.123456+00:00"}
+
+
+@pytest.mark.parametrize(
+    ("url", "lastmod", "expected"),
+    [
+        ("https://example.com/new", "2025-03-01T00:00:00Z", True),
+        (URL, None, True),
+        (URL, "", True),
+        (URL, "not a date", True),
+        (URL, "2025-03-01T13:00:00Z", True),
+        (URL, "2025-03-01T22:00:00+09:00", True),
+        (URL, "2025-03-01T11:00:00Z", False),
+        (URL, "2025-03-01T20:00:00+09:00", False),
+    ],
+)
+def test_needs_fetch(url: str, lastmod: Optional[str], expected: bool) -> None:
+    """needs_fetch refetches new URLs, entries without a usable lastmod and updated pages."""
+    assert needs_fetch(url, lastmod, URL_LATEST) is expected
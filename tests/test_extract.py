@@ -0,0 +1,52 @@
+"""Unit tests for the pure functions of arknights_crawler.extract."""
+
+from typing import List, Tuple
+
+import pytest
+
+from arknights_crawler.extract import extract_body, parse_meta_ids
+
+
+@pytest.mark.parametrize(
+    ("html", "expected"),
+    [
+        (b'<html><body><div id="body">plain</div></body></html>', "plain"),
+        (b"<div id=body>unquoted id</div>", "unquoted id"),
+        (
+            b'<div id="menu"><div>m</div></div><div id="body">a<div>b<div>c</div></div>d</div><div>after</div>',
+            "a<div>b<div>c</div></div>d",
+        ),
+        (b'<DIV ID="body">A<Div>b</DIV>c</div>', "A<div>b</div>c"),
+        (b'<div id="body">a<!-- </div> -->b</div>', "a<!-- </div> -->b"),
+        (
+            b'<div id="body"><script>if (a) { x = "</div>"; }</script>b</div>',
+            '<script>if (a) { x = "</div>"; }</script>b',
+        ),
+        (b'<div id="body" data-x="a>b">content</div>', "content"),
+        (b'<div id="body"><div title="</div>">a</div></div>', '<div title="&lt;/div&gt;">a</div>'),
+        (b'<div id="body">a<div>unbalanced</div>', "a<div>unbalanced</div>"),
+        (
+            '<div id="body">日本語 <a href="/x?a=1&amp;b=2">link</a></div>'.encode("utf-8"),
+            '日本語 <a href="/x?a=1&amp;b=2">link</a>',
+        ),
+        (b"<div>no body here</div>", ""),
+    ],
+)
+def test_extract_body(html: bytes, expected: str) -> None:
+    """extract_body returns the inner HTML of <div id="body">, or an empty string."""
+    assert extract_body(html) == expected
+
+
+@pytest.mark.parametrize(
+    ("lines", "expected"),
+    [
+        ([b'{"id": 1, "original_html_id": 10}', b'{"id": 2, "original_html_id": 12}'], [(1, 10), (2, 12)]),
+        ([b'{"id": 3}'], [(3, 0)]),
+        ([b"not json", b'{"id": 4, "original_html_id": 9}'], [(4, 9)]),
+        ([b'{"id": "x", "original_html_id": 1}', b'{"id": 5, "original_html_id": 2}'], [(5, 2)]),
+        ([], []),
+    ],
+)
+def test_parse_meta_ids(lines: List[bytes], expected: List[Tuple[int, int]]) -> None:
+    """parse_meta_ids yields (id, original_html_id) pairs and skips invalid lines."""
+    assert list(parse_meta_ids(lines)) == expected
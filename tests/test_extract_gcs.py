@@ -0,0 +1,198 @@
+"""Tests for the GCS-facing logic of arknights_crawler.extract, run against an in-memory bucket."""
+
+import asyncio
+import io
+from typing import Dict, List, Optional, Set
+
+import orjson
+import pytest
+
+from arknights_crawler import extract
+
+
+class FakeBlob:
+    """In-memory stand-in for storage.Blob, backed by its FakeBucket."""
+
+    def __init__(self, bucket: "FakeBucket", name: str) -> None:
+        self.bucket = bucket
+        self.name = name
+        self.metadata: Optional[Dict[str, str]] = bucket.metadata.get(name)
+        self.content_type: Optional[str] = None
+        self.content_encoding: Optional[str] = None
+
+    def download_as_bytes(self, **kwargs) -> bytes:
+        """Returns the stored content, failing for names listed in bucket.fail_downloads."""
+        if self.name in self.bucket.fail_downloads:
+            raise RuntimeError(f"download of {self.name} failed")
+        return self.bucket.objects[self.name]
+
+    def upload_from_string(self, data, content_type: Optional[str] = None, **kwargs) -> None:
+        """Stores data, failing for names listed in bucket.fail_uploads."""
+        if self.name in self.bucket.fail_uploads:
+            raise RuntimeError(f"upload of {self.name} failed")
+        self.bucket.objects[self.name] = data.encode("utf-8") if isinstance(data, str) else data
+
+    def upload_from_file(self, file: io.BytesIO, rewind: bool = False, **kwargs) -> None:
+        """Stores the file content, failing for names listed in bucket.fail_uploads."""
+        if rewind:
+            file.seek(0)
+        self.upload_from_string(file.read())
+
+    def compose(self, sources: List["FakeBlob"], **kwargs) -> None:
+        """Concatenates the sources into this blob, like GCS compose."""
+        assert len(sources) <= extract.MAX_COMPOSE_SOURCES
+        self.bucket.compose_sizes.append(len(sources))
+        self.bucket.objects[self.name] = b"".join(self.bucket.objects[source.name] for source in sources)
+        self.bucket.metadata[self.name] = self.metadata
+
+
+class FakeBucket:
+    """In-memory stand-in for storage.Bucket."""
+
+    def __init__(self) -> None:
+        self.objects: Dict[str, bytes] = {}
+        self.metadata: Dict[str, Optional[Dict[str, str]]] = {}
+        self.fail_downloads: Set[str] = set()
+        self.fail_uploads: Set[str] = set()
+        self.compose_sizes: List[int] = []
+
+    def blob(self, name: str) -> FakeBlob:
+        """Returns a handle for the named blob."""
+        return FakeBlob(self, name)
+
+    def list_blobs(self, prefix: str = "", **kwargs) -> List[FakeBlob]:
+        """Lists the blobs under prefix in name order."""
+        return [FakeBlob(self, name) for name in sorted(self.objects) if name.startswith(prefix)]
+
+    def delete_blobs(self, blobs: List[FakeBlob]) -> None:
+        """Deletes the given blobs."""
+        for blob in blobs:
+            del self.objects[blob.name]
+
+
+class FakeClient:
+    """storage.Client replacement that always returns the same FakeBucket."""
+
+    bucket_instance: FakeBucket
+
+    def __init__(self, project: Optional[str] = None) -> None:
+        pass
+
+    def bucket(self, name: str) -> FakeBucket:
+        """Returns the shared fake bucket."""
+        return self.bucket_instance
+
+
+def jsonl(records: List[Dict]) -> bytes:
+    """Encodes records as JSONL."""
+    return b"".join(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE) for record in records)
+
+
+def meta_ids(content: bytes) -> List[int]:
+    """Returns the ids of the JSONL records in content."""
+    return [orjson.loads(line)["id"] for line in content.splitlines()]
+
+
+@pytest.fixture
+def bucket(monkeypatch: pytest.MonkeyPatch) -> FakeBucket:
+    """A fake bucket that extract's storage.Client returns."""
+    fake = FakeBucket()
+    FakeClient.bucket_instance = fake
+    monkeypatch.setattr(extract.storage, "Client", FakeClient)
+    return fake
+
+
+def test_get_latest_max_ids_reads_summary_metadata(bucket: FakeBucket) -> None:
+    """The summary metadata of the latest meta file is used without downloading it."""
+    bucket.objects["meta/extracted_20250101000000.jsonl"] = b""
+    bucket.objects["meta/extracted_20250102000000.jsonl"] = b""
+    bucket.metadata["meta/extracted_20250101000000.jsonl"] = {"max_id": "99", "max_original_html_id": "99"}
+    bucket.metadata["meta/extracted_20250102000000.jsonl"] = {"max_id": "7", "max_original_html_id": "12"}
+    bucket.fail_downloads.add("meta/extracted_20250102000000.jsonl")
+
+    assert extract.get_latest_max_ids(bucket) == (7, 12)
+
+
+def test_get_latest_max_ids_falls_back_to_jsonl(bucket: FakeBucket) -> None:
+    """Without a summary, the maxima are read from the JSONL content, skipping invalid lines."""
+    bucket.objects["meta/extracted_20250101000000.jsonl"] = jsonl([{"id": 50, "original_html_id": "50"}])
+    bucket.objects["meta/extracted_20250102000000.jsonl"] = (
+        jsonl([{"id": 3, "original_html_id": "10"}, {"id": 4, "original_html_id": "8"}]) + b"broken\n"
+    )
+
+    assert extract.get_latest_max_ids(bucket) == (4, 10)
+
+
+def test_get_latest_max_ids_without_meta_files(bucket: FakeBucket) -> None:
+    """(0, 0) is returned when there is no meta file yet."""
+    assert extract.get_latest_max_ids(bucket) == (0, 0)
+
+
+def test_compose_blobs_folds_more_than_max_sources(bucket: FakeBucket) -> None:
+    """More than MAX_COMPOSE_SOURCES parts are composed in order and the parts are deleted."""
+    names = [f"meta/parts/p_{i}.jsonl" for i in range(70)]
+    for i, name in enumerate(names):
+        bucket.objects[name] = jsonl([{"id": i}])
+
+    extract.compose_blobs(bucket, names, "meta/out.jsonl", content_type="application/json", metadata={"max_id": "69"})
+
+    assert meta_ids(bucket.objects["meta/out.jsonl"]) == list(range(70))
+    assert bucket.metadata["meta/out.jsonl"] == {"max_id": "69"}
+    assert bucket.compose_sizes == [32, 32, 8]
+    assert not any(name.startswith("meta/parts/") for name in bucket.objects)
+
+
+def add_html_blobs(bucket: FakeBucket, count: int) -> None:
+    """Stores count crawled pages as html/{id}.html."""
+    for i in range(1, count + 1):
+        bucket.objects[f"html/{i}.html"] = f'<div id="body">page {i}</div>'.encode("utf-8")
+
+
+def composed_meta(bucket: FakeBucket) -> List[str]:
+    """Returns the names of the composed meta files."""
+    return [name for name in bucket.objects if name.startswith("meta/extracted_")]
+
+
+def test_run_extraction_composes_all_chunks(bucket: FakeBucket) -> None:
+    """A successful run composes every chunk into one meta file with the run's maxima."""
+    add_html_blobs(bucket, 7)
+
+    asyncio.run(extract.run_extraction_async(3, "project", "bucket"))
+
+    [meta_name] = composed_meta(bucket)
+    assert meta_ids(bucket.objects[meta_name]) == list(range(1, 8))
+    assert bucket.metadata[meta_name] == {"max_id": "7", "max_original_html_id": "7"}
+    assert bucket.objects["extracted/3.html"] == b"page 3"
+    assert extract.get_latest_max_ids(bucket) == (7, 7)
+
+
+def test_run_extraction_keeps_chunks_before_failed_chunk(bucket: FakeBucket) -> None:
+    """When a chunk upload fails, only the chunks before it are composed and the error is raised."""
+    add_html_blobs(bucket, 9)
+    original_upload = FakeBlob.upload_from_string
+
+    def upload_from_string(blob: FakeBlob, data, **kwargs) -> None:
+        if blob.name.startswith("meta/parts/") and blob.name.endswith("_2.jsonl"):
+            raise RuntimeError("chunk 2 failed")
+        original_upload(blob, data, **kwargs)
+
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(FakeBlob, "upload_from_string", upload_from_string)
+        with pytest.raises(RuntimeError, match="chunk 2 failed"):
+            asyncio.run(extract.run_extraction_async(3, "project", "bucket"))
+
+    [meta_name] = composed_meta(bucket)
+    assert meta_ids(bucket.objects[meta_name]) == [1, 2, 3]
+    assert bucket.metadata[meta_name] == {"max_id": "3", "max_original_html_id": "3"}
+
+
+def test_run_extraction_stops_before_failed_blob(bucket: FakeBucket) -> None:
+    """A failed extraction upload stops the run, and the next run starts again from that blob."""
+    add_html_blobs(bucket, 12)
+    bucket.fail_uploads.add("extracted/5.html")
+
+    with pytest.raises(RuntimeError, match="extracted/5.html"):
+        asyncio.run(extract.run_extraction_async(2, "project", "bucket"))
+
+    assert extract.get_latest_max_ids(bucket) == (4, 4)
+    assert extract.list_new_html_blobs(bucket, min_original_id=4)[0].name == "html/5.html"